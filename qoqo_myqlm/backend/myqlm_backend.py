@@ -12,14 +12,19 @@
 # or implied. See the License for the specific language governing permissions and limitations under
 # the License.
 from qoqo import Circuit
-from typing import Optional, Dict, List, Tuple, cast, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Iterable, List, Tuple, Any
 from qoqo_myqlm.interface import myqlm_call_circuit
 import numpy as np
 import warnings
-import qat
-from qat.qpus import get_default_qpu
+import qat.core
 import time
 
+_REGISTER_DEFINITIONS = frozenset(
+    ("DefinitionBit", "DefinitionFloat", "DefinitionComplex")
+)
+
 
 class MyQLMBackend(object):
     r"""Backend to qoqo that produces MyQLM output which can be imported.
@@ -39,6 +44,8 @@ class MyQLMBackend(object):
         qpu: Any = None,  # noqa
         mode: str = "active_qubits_only",
         time_QLM_submission: bool = False,
+        circuit_memoization_size: int = 4,
+        number_workers: int = 1,
     ) -> None:  # noqa
         """Initialize MyQLM Backend
 
@@ -52,21 +59,34 @@ class MyQLMBackend(object):
                 - SAMPLE (default): measures Z on all qubits
                 - OBS: measures a specific observable, defined by a matrix on all qubits
             observable: if "OBS" is selected as the job type, this is the matrix of
-                        the observable to measure.
+                        the observable to measure. Its expectation value is written to the
+                        first output float register of the circuit. Reassigning
+                        `observable` or `number_qubits` later applies to the next run.
             qpu: QPU machine to use (quantum processor or simulator) with relevant keywords
             mode: noise mode, can be active_qubits_only, parallelization_blocks, all_qubits
             time_QLM_submission: toggle the print of the timing for the job submission to QLM
+            circuit_memoization_size: The number of translated circuits kept in memory, so that
+                                      running the same circuit again skips the translation.
+                                      Set to 0 to disable the memoization.
+            number_workers: The number of threads submitting the circuits of a measurement.
+                            With 1 (default), all circuits are submitted as a single batch,
+                            otherwise each circuit is submitted on its own, concurrently.
 
         Raises:
             TypeError: Job_type specified is neither 'SAMPLE' nor 'OBS'
         """
         self.name = "myqlm"
-        self.number_qubits = number_qubits
+        self._number_qubits = number_qubits
         self.number_measurements = number_measurements
         self.device = device
         self.job_type = job_type
         self._timing_qlm = time_QLM_submission
+        self.circuit_memoization_size = circuit_memoization_size
+        self._compiled_circuits: OrderedDict = OrderedDict()
+        self.number_workers = number_workers
         if qpu is None:
+            from qat.qpus import get_default_qpu
+
             qpu = get_default_qpu()
         self.qpu = qpu
         self.all_qubits = True if mode == "all_qubits" else False
@@ -89,6 +109,39 @@ class MyQLMBackend(object):
         else:
             raise TypeError("Job_type specified is neither 'SAMPLE' nor 'OBS'")
 
+    @property
+    def number_qubits(self) -> int:
+        """The number of qubits to use"""
+        return self._number_qubits
+
+    @number_qubits.setter
+    def number_qubits(self, number_qubits: int) -> None:
+        self._number_qubits = number_qubits
+        self._update_observable()
+
+    @property
+    def observable(self) -> Optional[np.ndarray]:
+        """The matrix of the observable to measure, None for SAMPLE jobs"""
+        return self._observable_matrix
+
+    @observable.setter
+    def observable(self, observable: Optional[np.ndarray]) -> None:
+        self._observable_matrix = observable
+        self._update_observable()
+
+    def _update_observable(self) -> None:
+        """Create the MyQLM observable shared by all submitted jobs
+
+        It is rebuilt whenever the observable matrix or the number of qubits is reassigned.
+        """
+        self._observable = (
+            None
+            if self._observable_matrix is None
+            else qat.core.Observable(
+                nqbits=self._number_qubits, matrix=self._observable_matrix
+            )
+        )
+
     def run_circuit(self, circuit: Circuit) -> Tuple[
         Dict[str, List[List[bool]]],
         Dict[str, List[List[float]]],
@@ -104,77 +157,204 @@ class MyQLMBackend(object):
                   Dict[str, List[List[float]]],
                   Dict[str, List[List[complex]]]]
         """
-        # Initializing the classical registers for calculation and output
-        internal_bit_register_dict: Dict[str, List[bool]] = dict()
-        internal_float_register_dict: Dict[str, List[float]] = dict()
-        internal_complex_register_dict: Dict[str, List[complex]] = dict()
+        registers = self._initialize_registers(circuit)
+        job = self._create_job(circuit)
+        (result,) = self._submit([job])
+        self._fill_registers(registers, result)
+        return registers
+
+    def _initialize_registers(self, circuit: Circuit) -> Tuple[
+        Dict[str, List[List[bool]]],
+        Dict[str, List[List[float]]],
+        Dict[str, List[List[complex]]],
+    ]:
+        """Initialize the classical registers defined in the circuit
+
+        Args:
+            circuit: The circuit defining the registers
+
+        Returns:
+            Tuple[Dict[str, List[List[bool]]],
+                  Dict[str, List[List[float]]],
+                  Dict[str, List[List[complex]]]]: the empty output registers
 
+        Raises:
+            RuntimeError: OBS job without an output DefinitionFloat for the expectation value
+        """
+        # Only the output registers are needed, the backend does not run classical operations
         output_bit_register_dict: Dict[str, List[List[bool]]] = dict()
         output_float_register_dict: Dict[str, List[List[float]]] = dict()
         output_complex_register_dict: Dict[str, List[List[complex]]] = dict()
 
-        for bit_def in circuit.filter_by_tag("DefinitionBit"):
-            internal_bit_register_dict[bit_def.name()] = [
-                False for _ in range(bit_def.length())
-            ]
-            if bit_def.is_output():
-                output_bit_register_dict[bit_def.name()] = list()
-
-        for float_def in circuit.filter_by_tag("DefinitionFloat"):
-            internal_float_register_dict[float_def.name()] = [
-                0.0 for _ in range(float_def.length())
-            ]
-            if float_def.is_output():
-                output_float_register_dict[float_def.name()] = cast(
-                    List[List[float]], list()
-                )
+        # A single pass over the definitions, which qoqo stores apart from the other operations
+        # Definitions such as InputSymbolic have no register and no is_output, so are skipped
+        for definition in circuit.definitions():
+            definition_type = definition.hqslang()
+            if (
+                definition_type not in _REGISTER_DEFINITIONS
+                or not definition.is_output()
+            ):
+                continue
+            if definition_type == "DefinitionBit":
+                output_bit_register_dict[definition.name()] = list()
+            elif definition_type == "DefinitionFloat":
+                output_float_register_dict[definition.name()] = list()
+            elif definition_type == "DefinitionComplex":
+                output_complex_register_dict[definition.name()] = list()
 
-        for complex_def in circuit.filter_by_tag("DefinitionComplex"):
-            internal_complex_register_dict[complex_def.name()] = [
-                complex(0.0) for _ in range(complex_def.length())
-            ]
-            if complex_def.is_output():
-                output_complex_register_dict[complex_def.name()] = cast(
-                    List[List[complex]], list()
-                )
+        # Checked before any job is submitted, as OBS results are written to a float register
+        if self._observable is not None and not output_float_register_dict:
+            raise RuntimeError(
+                "OBS job_type needs an output DefinitionFloat in the circuit "
+                "to store the expectation value of the observable"
+            )
 
-        compiled_circuit = myqlm_call_circuit(
-            circuit, self.number_qubits, self.all_qubits
+        return (
+            output_bit_register_dict,
+            output_float_register_dict,
+            output_complex_register_dict,
         )
 
-        if self.observable is None:
-            job = compiled_circuit.to_job(
+    def _create_job(self, circuit: Circuit) -> qat.core.Job:
+        """Create the MyQLM job running the circuit
+
+        Args:
+            circuit: The circuit that is run
+
+        Returns:
+            qat.core.Job: The job to submit to the QPU
+        """
+        compiled_circuit = self._compile_circuit(circuit)
+
+        if self._observable is None:
+            return compiled_circuit.to_job(
                 job_type="SAMPLE",
                 nbshots=self.number_measurements,
                 aggregate_data=False,
             )
-        else:
-            obs = qat.core.Observable(nqbits=self.number_qubits, matrix=self.observable)
-            job = compiled_circuit.to_job(
-                job_type="OBS",
-                nbshots=self.number_measurements,
-                observable=obs,
-                aggregate_data=False,
-            )
+        return compiled_circuit.to_job(
+            job_type="OBS",
+            nbshots=self.number_measurements,
+            observable=self._observable,
+            aggregate_data=False,
+        )
+
+    def _submit(self, jobs: List[qat.core.Job]) -> List[qat.core.Result]:
+        """Submit the jobs to the QPU, as a single batch when there are several jobs
+
+        Args:
+            jobs: The jobs that are submitted
+
+        Returns:
+            List[qat.core.Result]: The results of the jobs, in the order of the jobs
+        """
         start_time = time.time()
-        result = self.qpu.submit(job)
-        end_time = time.time()
+        if len(jobs) == 1:
+            results = [self.qpu.submit(jobs[0])]
+        else:
+            results = self.qpu.submit(qat.core.Batch(jobs=jobs)).results
+        self._print_submission_time(time.time() - start_time)
+        return results
+
+    def _submit_concurrently(
+        self, jobs: Iterable[qat.core.Job]
+    ) -> List[qat.core.Result]:
+        """Submit the jobs to the QPU concurrently with number_workers threads
+
+        Each job is submitted as soon as it is produced by the jobs iterable, so that creating
+        the next jobs overlaps with running the previous ones. Only the submissions and the
+        waits for the results are timed, not the creation of the jobs.
+
+        Args:
+            jobs: The jobs that are submitted
+
+        Returns:
+            List[qat.core.Result]: The results of the jobs, in the order of the jobs
+        """
+        elapsed_time = 0.0
+        with ThreadPoolExecutor(max_workers=self.number_workers) as executor:
+            futures = []
+            for job in jobs:
+                start_time = time.time()
+                futures.append(executor.submit(self.qpu.submit, job))
+                elapsed_time += time.time() - start_time
+            start_time = time.time()
+            results = [future.result() for future in futures]
+            elapsed_time += time.time() - start_time
+        self._print_submission_time(elapsed_time)
+        return results
+
+    def _print_submission_time(self, elapsed_time: float) -> None:
+        """Print the time spent submitting jobs to QLM, if time_QLM_submission is set
+
+        Args:
+            elapsed_time: The time spent submitting jobs, in seconds
+        """
         if self._timing_qlm:
-            print(
-                f"Elapsed time (QLM job submission): {end_time - start_time:.2f} seconds"
-            )
+            print(f"Elapsed time (QLM job submission): {elapsed_time:.2f} seconds")
 
-        for sample in result:
-            array = [qubit_state for qubit_state in sample.state]
-            output_bit_register_dict[list(output_bit_register_dict.keys())[0]].append(
-                array
-            )
+    def _fill_registers(
+        self,
+        registers: Tuple[
+            Dict[str, List[List[bool]]],
+            Dict[str, List[List[float]]],
+            Dict[str, List[List[complex]]],
+        ],
+        result: qat.core.Result,
+    ) -> None:
+        """Write the result of a job to the output registers
 
-        return (
-            output_bit_register_dict,
-            output_float_register_dict,
-            output_complex_register_dict,
+        Args:
+            registers: The output registers of the circuit that was run
+            result: The result of the job running the circuit
+        """
+        if self._observable is not None:
+            # OBS jobs return the expectation value of the observable instead of samples
+            output_float_register_dict = registers[1]
+            output_float_register_dict[
+                list(output_float_register_dict.keys())[0]
+            ].append([result.value])
+            return
+
+        output_bit_register_dict = registers[0]
+        # The bitstrings of all samples are converted at once, one row per sample
+        bitstrings = "".join(sample.state.bitstring for sample in result)
+        measured_bits = np.frombuffer(bitstrings.encode(), dtype=np.uint8).reshape(
+            -1, self.number_qubits
+        ) == ord("1")
+        output_bit_register_dict[list(output_bit_register_dict.keys())[0]].extend(
+            measured_bits.tolist()
+        )
+
+    def _compile_circuit(self, circuit: Circuit) -> Any:  # noqa
+        """Translate the circuit to MyQLM, reusing the memoized translation when available
+
+        The memoized translations are keyed on the serialized circuit, so that equal circuits
+        hit the memoization even when they are different objects.
+
+        Args:
+            circuit: The circuit that is translated
+
+        Returns:
+            Any: The translated MyQLM circuit
+        """
+        # Without memoization, the circuit is not serialized to build the key
+        if self.circuit_memoization_size <= 0:
+            return myqlm_call_circuit(circuit, self.number_qubits, self.all_qubits)
+
+        key = (bytes(circuit.to_bincode()), self.number_qubits, self.all_qubits)
+        compiled_circuit = self._compiled_circuits.get(key)
+        if compiled_circuit is not None:
+            self._compiled_circuits.move_to_end(key)
+            return compiled_circuit
+
+        compiled_circuit = myqlm_call_circuit(
+            circuit, self.number_qubits, self.all_qubits
         )
+        self._compiled_circuits[key] = compiled_circuit
+        if len(self._compiled_circuits) > self.circuit_memoization_size:
+            self._compiled_circuits.popitem(last=False)
+        return compiled_circuit
 
     def run_measurement_registers(
         self,
@@ -198,17 +378,29 @@ class MyQLMBackend(object):
         output_bit_register_dict: Dict[str, List[List[bool]]] = dict()
         output_float_register_dict: Dict[str, List[List[float]]] = dict()
         output_complex_register_dict: Dict[str, List[List[complex]]] = dict()
-        for circuit in measurement.circuits():
-            if constant_circuit is None:
-                run_circuit = circuit
-            else:
-                run_circuit = constant_circuit + circuit
+        run_circuits = [
+            circuit if constant_circuit is None else constant_circuit + circuit
+            for circuit in measurement.circuits()
+        ]
+        registers = [self._initialize_registers(circuit) for circuit in run_circuits]
+        if self.number_workers > 1 and len(run_circuits) > 1:
+            # The circuits are translated lazily, so that the translation of a circuit
+            # overlaps with running the previously submitted ones
+            results = self._submit_concurrently(
+                self._create_job(circuit) for circuit in run_circuits
+            )
+        else:
+            results = self._submit(
+                [self._create_job(circuit) for circuit in run_circuits]
+            )
 
+        for tmp_registers, result in zip(registers, results):
+            self._fill_registers(tmp_registers, result)
             (
                 tmp_bit_register_dict,
                 tmp_float_register_dict,
                 tmp_complex_register_dict,
-            ) = self.run_circuit(run_circuit)
+            ) = tmp_registers
             output_bit_register_dict.update(tmp_bit_register_dict)
             output_float_register_dict.update(tmp_float_register_dict)
             output_complex_register_dict.update(tmp_complex_register_dict)
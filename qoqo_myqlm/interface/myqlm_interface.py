@@ -12,7 +12,9 @@
 # or implied. See the License for the specific language governing permissions and limitations under
 # the License.
 from qoqo import Circuit
-from typing import cast, List, Any
+import functools
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Union
 import qat.lang.AQASM as qlm
 from .utilities import generate_VariableMSXX_matrix
 
@@ -37,27 +39,43 @@ def myqlm_call_circuit(
     """
     myqlm_program = qlm.Program()
     qureg = myqlm_program.qalloc(number_qubits)
+    # Indexing a list is cheaper than indexing the MyQLM register for every operation
+    qubits = [qureg[qubit] for qubit in range(number_qubits)]
+    # Bound once, as they are called for every operation of the circuit
+    apply = myqlm_program.apply
+    reset = myqlm_program.reset
     for op in circuit:
-        if "PragmaActiveReset" in op.tags():
-            myqlm_program.reset(op.involved_qubits)
-        elif "PragmaLoop" in op.tags():
+        tags = op.tags()
+        # The last tag of a qoqo operation is the name of the operation itself
+        operation_name = tags[-1]
+        if operation_name == "PragmaActiveReset":
+            reset([qubits[qubit] for qubit in sorted(op.involved_qubits())])
+        elif operation_name == "PragmaLoop":
             number_of_repetitions = max(0, int(op.repetitions().value))
+            if number_of_repetitions == 0:
+                continue
+            # The loop body is translated once and its instructions applied in every repetition
+            loop_instructions = [
+                loop_instruction
+                for loop_instruction in (
+                    myqlm_call_operation(op_loop, qubits) for op_loop in op.circuit()
+                )
+                if loop_instruction is not None
+            ]
             for _ in range(number_of_repetitions):
-                for op_loop in op.circuit():
-                    instructions = myqlm_call_operation(op_loop, qureg)
-                    if instructions is not None:
-                        myqlm_program.apply(*instructions)
-                        if noise_mode_all_qubits:
-                            apply_I_on_inactive_qubits(
-                                number_qubits, myqlm_program, qureg, instructions
-                            )
+                for loop_instruction in loop_instructions:
+                    apply(*loop_instruction)
+                    if noise_mode_all_qubits:
+                        apply_I_on_inactive_qubits(
+                            number_qubits, myqlm_program, qubits, loop_instruction
+                        )
         else:
-            instructions = myqlm_call_operation(op, qureg)
+            instructions = myqlm_call_operation(op, qubits, tags)
             if instructions is not None:
-                myqlm_program.apply(*instructions)
+                apply(*instructions)
                 if noise_mode_all_qubits:
                     apply_I_on_inactive_qubits(
-                        number_qubits, myqlm_program, qureg, instructions
+                        number_qubits, myqlm_program, qubits, instructions
                     )
 
     myqlm_circuit = myqlm_program.to_circ()
@@ -67,7 +85,7 @@ def myqlm_call_circuit(
 def apply_I_on_inactive_qubits(
     number_qubits: int,
     myqlm_program: qlm.program.Program,
-    qureg: qlm.bits.QRegister,
+    qureg: Union[qlm.bits.QRegister, List[qlm.bits.Qbit]],
     instructions: List,
 ) -> None:
     """Applies an I gate to all inactive qubits in a quantum circuit.
@@ -75,101 +93,212 @@ def apply_I_on_inactive_qubits(
     Args:
         number_qubits: The total number of qubits in the circuit.
         myqlm_program : The QLM program to which to add the gate operations.
-        qureg : The quantum register to which to apply the gate operations.
+        qureg : The quantum register, or the list of its qubits, to which to apply the gate
+                operations.
         instructions : A list of instructions specifying the active qubits.
     """
-    active_qubits = [int(qb.to_dict()["data"]) for qb in instructions[1:]]
+    active_qubits = {qb.index for qb in instructions[1:]}
     for qubit in range(number_qubits):
         if qubit not in active_qubits:
             myqlm_program.apply(qlm.I, qureg[qubit])
 
 
-def myqlm_call_operation(operation: Any, qureg: qlm.Program.qalloc) -> List:  # noqa
+# The parametrized VariableMSXX gate is defined once and bound to theta for each operation
+_VARIABLE_MSXX_GATE = qlm.AbstractGate(
+    "VariableMSXX",
+    [float],
+    arity=2,
+    matrix_generator=generate_VariableMSXX_matrix,
+)
+
+
+def _variable_msxx(operation: Any, qureg: qlm.Program.qalloc) -> List:  # noqa
+    """Build the MyQLM instruction for a VariableMSXX operation
+
+    Args:
+        operation: The qoqo VariableMSXX operation
+        qureg: The quantum register the instruction acts on
+
+    Returns:
+        List: arguments to be used in the "apply" function
+    """
+    return [
+        _VARIABLE_MSXX_GATE(operation.theta().float()),
+        qureg[operation.control()],
+        qureg[operation.target()],
+    ]
+
+
+def _fixed_matrix(matrix: np.ndarray) -> np.ndarray:
+    """Return the given matrix, as matrix generator of gates without parameters
+
+    Args:
+        matrix: The unitary matrix of the gate
+
+    Returns:
+        np.ndarray: the unchanged matrix
+    """
+    return matrix
+
+
+@functools.lru_cache(maxsize=256)
+def _abstract_gate(name: str, matrix_bytes: bytes, arity: int) -> qlm.AbstractGate:
+    """Create the MyQLM gate with a fixed unitary matrix, cached per matrix
+
+    Args:
+        name: The name of the MyQLM gate
+        matrix_bytes: The raw bytes of the complex unitary matrix of the gate
+        arity: The number of qubits the gate acts on
+
+    Returns:
+        qlm.AbstractGate: The MyQLM gate
+    """
+    dimension = 2**arity
+    matrix = np.frombuffer(matrix_bytes, dtype=np.complex128).reshape(
+        dimension, dimension
+    )
+    return qlm.AbstractGate(
+        name,
+        [],
+        arity=arity,
+        matrix_generator=functools.partial(_fixed_matrix, matrix),
+    )
+
+
+def _matrix_gate(
+    operation: Any, qureg: qlm.Program.qalloc, name: str, arity: int  # noqa
+) -> List:
+    """Build a MyQLM instruction from the unitary matrix of a qoqo gate operation
+
+    Args:
+        operation: The qoqo gate operation
+        qureg: The quantum register the instruction acts on
+        name: The name of the generated MyQLM gate
+        arity: The number of qubits the gate acts on (1 or 2)
+
+    Returns:
+        List: arguments to be used in the "apply" function
+    """
+    matrix = np.ascontiguousarray(operation.unitary_matrix(), dtype=np.complex128)
+    gate = _abstract_gate(name, matrix.tobytes(), arity)
+    if arity == 1:
+        return [gate(), qureg[operation.qubit()]]
+    return [gate(), qureg[operation.control()], qureg[operation.target()]]
+
+
+def _single_qubit_builder(gate: Any) -> Callable:  # noqa
+    """Create the instruction builder of a fixed single-qubit gate
+
+    Args:
+        gate: The MyQLM gate, bound once when the builder is created
+
+    Returns:
+        Callable: builder of the "apply" arguments from the operation and the register
+    """
+    return lambda op, qureg: [gate, qureg[op.qubit()]]
+
+
+def _two_qubit_builder(gate: Any) -> Callable:  # noqa
+    """Create the instruction builder of a fixed two-qubit gate
+
+    Args:
+        gate: The MyQLM gate, bound once when the builder is created
+
+    Returns:
+        Callable: builder of the "apply" arguments from the operation and the register
+    """
+    return lambda op, qureg: [gate, qureg[op.control()], qureg[op.target()]]
+
+
+def _rotation_builder(gate: Any) -> Callable:  # noqa
+    """Create the instruction builder of a single-qubit rotation
+
+    The gate instances are cached per angle, so that rotations repeated with the same angle
+    (e.g. in loops or Trotter steps) share one instance.
+
+    Args:
+        gate: The parametrized MyQLM gate, bound once when the builder is created
+
+    Returns:
+        Callable: builder of the "apply" arguments from the operation and the register
+    """
+    rotation = functools.lru_cache(maxsize=4096)(gate)
+    return lambda op, qureg: [rotation(op.theta().float()), qureg[op.qubit()]]
+
+
+# Builders for the operations with a native MyQLM counterpart, keyed on the qoqo tag
+_GATE_BUILDERS: Dict[str, Callable[[Any, qlm.Program.qalloc], List]] = {
+    "RotateZ": _rotation_builder(qlm.RZ),
+    "RotateX": _rotation_builder(qlm.RX),
+    "RotateY": _rotation_builder(qlm.RY),
+    "CNOT": _two_qubit_builder(qlm.CNOT),
+    "Hadamard": _single_qubit_builder(qlm.H),
+    "PauliX": _single_qubit_builder(qlm.X),
+    "PauliY": _single_qubit_builder(qlm.Y),
+    "PauliZ": _single_qubit_builder(qlm.Z),
+    "SGate": _single_qubit_builder(qlm.S),
+    "TGate": _single_qubit_builder(qlm.T),
+    "ControlledPauliZ": _two_qubit_builder(qlm.CSIGN),
+    "ControlledPauliY": _two_qubit_builder(qlm.Y.ctrl()),
+    "SWAP": _two_qubit_builder(qlm.SWAP),
+    "ISwap": _two_qubit_builder(qlm.ISWAP),
+    "VariableMSXX": _variable_msxx,
+}
+
+# Generic gate tags translated via the unitary matrix, with the arity of the gate
+_MATRIX_ARITIES: Dict[str, int] = {
+    "SingleQubitGateOperation": 1,
+    "TwoQubitGateOperation": 2,
+}
+
+# Tags of the operations that have no MyQLM instruction
+_SKIPPED_TAGS = frozenset(
+    (
+        "MeasureQubit",
+        "Definition",
+        "PragmaRepeatedMeasurement",
+        "PragmaSetNumberOfMeasurements",
+        "PragmaStartDecompositionBlock",
+        "PragmaGlobalPhase",
+        "PragmaStopDecompositionBlock",
+        "PragmaStopParallelBlock",
+    )
+)
+
+
+def myqlm_call_operation(
+    operation: Any,  # noqa
+    qureg: qlm.Program.qalloc,
+    tags: Optional[List[str]] = None,
+) -> Optional[List]:
     """Translate a qoqo operation to MyQLM text
 
+    Gates with a native MyQLM counterpart are looked up by the name of the operation (its last
+    tag). The other tags are then looked up from the most specific to the most generic one,
+    to translate the remaining gates via their unitary matrix.
+
     Args:
         operation: The qoqo operation that is translated
-        qureg: The quantum register pyquest_cffi operates on
+        qureg: The quantum register, or the list of its qubits, the operation acts on
+        tags: The tags of the operation, if already known to the caller. Fetched from the
+              operation when not given.
 
     Returns:
-        List: arguments to be used in the "apply" function
+        Optional[List]: arguments to be used in the "apply" function, None if the operation
+                        has no MyQLM instruction
 
     Raises:
         RuntimeError: Operation not in MyQLM backend
     """
-    op = cast(List, None)
-    tags = operation.tags()
-    if "RotateZ" in tags:
-        op = [qlm.RZ(operation.theta().float()), qureg[operation.qubit()]]
-    elif "RotateX" in tags:
-        op = [qlm.RX(operation.theta().float()), qureg[operation.qubit()]]
-    elif "RotateY" in tags:
-        op = [qlm.RY(operation.theta().float()), qureg[operation.qubit()]]
-    elif "CNOT" in tags:
-        op = [qlm.CNOT, qureg[operation.control()], qureg[operation.target()]]
-    elif "Hadamard" in tags:
-        op = [qlm.H, qureg[operation.qubit()]]
-    elif "PauliX" in tags:
-        op = [qlm.X, qureg[operation.qubit()]]
-    elif "PauliY" in tags:
-        op = [qlm.Y, qureg[operation.qubit()]]
-    elif "PauliZ" in tags:
-        op = [qlm.Z, qureg[operation.qubit()]]
-    elif "SGate" in tags:
-        op = [qlm.S, qureg[operation.qubit()]]
-    elif "TGate" in tags:
-        op = [qlm.T, qureg[operation.qubit()]]
-    elif "ControlledPauliZ" in tags:
-        op = [qlm.CSIGN, qureg[operation.control()], qureg[operation.target()]]
-    elif "ControlledPauliY" in tags:
-        op = [qlm.Y.ctrl(), qureg[operation.control()], qureg[operation.target()]]
-    elif "SWAP" in tags:
-        op = [qlm.SWAP, qureg[operation.control()], qureg[operation.target()]]
-    elif "ISwap" in tags:
-        op = [qlm.ISWAP, qureg[operation.control()], qureg[operation.target()]]
-    elif "VariableMSXX" in tags:
-        gate = qlm.AbstractGate(
-            "VariableMSXX",
-            [float],
-            arity=2,
-            matrix_generator=generate_VariableMSXX_matrix,
-        )
-        op = [
-            gate(operation.theta().float()),
-            qureg[operation.control()],
-            qureg[operation.target()],
-        ]
-
-    elif "SingleQubitGate" in tags:
-        matrix = operation.unitary_matrix()
-        gate = qlm.AbstractGate(tags[-1], [], arity=1, matrix_generator=lambda: matrix)
-        op = [gate(), qureg[operation.qubit()]]
-    elif "SingleQubitGateOperation" in tags:
-        matrix = operation.unitary_matrix()
-        gate = qlm.AbstractGate(tags[-1], [], arity=1, matrix_generator=lambda: matrix)
-        op = [gate(), qureg[operation.qubit()]]
-    elif "TwoQubitGateOperation" in tags:
-        gate_name = tags[-1]
-        matrix = operation.unitary_matrix()
-        gate = qlm.AbstractGate(gate_name, [], arity=2, matrix_generator=lambda: matrix)
-        op = [gate(), qureg[operation.control()], qureg[operation.target()]]
-    elif "MeasureQubit" in tags:
-        pass
-    elif "Definition" in tags:
-        pass
-    elif "PragmaRepeatedMeasurement" in tags:
-        pass
-    elif "PragmaSetNumberOfMeasurements" in tags:
-        pass
-    elif "PragmaStartDecompositionBlock" in tags:
-        pass
-    elif "PragmaGlobalPhase" in tags:
-        pass
-    elif "PragmaStopDecompositionBlock" in tags:
-        pass
-    elif "PragmaStopParallelBlock" in tags:
-        pass
-    else:
-        raise RuntimeError(f"Operation not in MyQLM backend tags={tags}")
-
-    return op
+    if tags is None:
+        tags = operation.tags()
+    builder = _GATE_BUILDERS.get(tags[-1])
+    if builder is not None:
+        return builder(operation, qureg)
+    for tag in reversed(tags):
+        arity = _MATRIX_ARITIES.get(tag)
+        if arity is not None:
+            return _matrix_gate(operation, qureg, tags[-1], arity)
+        if tag in _SKIPPED_TAGS:
+            return None
+    raise RuntimeError(f"Operation not in MyQLM backend tags={tags}")
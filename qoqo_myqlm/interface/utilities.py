@@ -9,6 +9,7 @@
 # is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
 # or implied. See the License for the specific language governing permissions and limitations under
 # the License.
+import math
 import numpy as np
 
 
@@ -17,15 +18,11 @@ def generate_VariableMSXX_matrix(theta: float):
     from https://hqsquantumsimulations.github.io/qoqo_examples/gate_operations/two_qubit_gates.html#variablesmsxx
     """
 
-    cos_component = np.cos(theta / 2)
-    sin_component = -1j * np.sin(theta / 2)
-    U = np.array(
-        [
-            [cos_component, 0, 0, sin_component],
-            [0, cos_component, sin_component, 0],
-            [0, sin_component, cos_component, 0],
-            [sin_component, 0, 0, cos_component],
-        ]
-    )
+    cos_component = math.cos(theta / 2)
+    sin_component = -1j * math.sin(theta / 2)
+    # Only the diagonal and the anti-diagonal are non-zero
+    U = np.zeros((4, 4), dtype=np.complex128)
+    U[0, 0] = U[1, 1] = U[2, 2] = U[3, 3] = cos_component
+    U[0, 3] = U[1, 2] = U[2, 1] = U[3, 0] = sin_component
 
     return U
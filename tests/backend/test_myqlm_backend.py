@@ -17,6 +17,7 @@ import numpy as np
 import numpy.testing as npt
 from qoqo import operations as ops
 from qoqo import Circuit
+from qoqo.measurements import ClassicalRegister
 from qoqo_myqlm import MyQLMBackend
 
 
@@ -37,6 +38,126 @@ def test_myqlm_backend():
     npt.assert_equal(bit_dict["ro"], [np.array([0.0, 1.0])] * 5)
 
 
+def test_myqlm_backend_input_symbolic():
+    """Testing that definitions without a register are ignored by the backend"""
+    circuit = Circuit()
+    circuit += ops.DefinitionBit(name="ro", length=1, is_output=True)
+    circuit += ops.InputSymbolic(name="x", input=1.0)
+    circuit += ops.PauliX(qubit=0)
+    circuit += ops.MeasureQubit(qubit=0, readout="ro", readout_index=0)
+
+    backend = MyQLMBackend(number_qubits=1, number_measurements=2)
+
+    (bit_dict, _, _) = backend.run_circuit(circuit)
+    npt.assert_equal(bit_dict, {"ro": [[True], [True]]})
+
+
+def test_myqlm_backend_circuit_memoization():
+    """Testing that repeated runs reuse the memoized translation of a circuit"""
+    circuit = Circuit()
+    circuit += ops.DefinitionBit(name="ro", length=2, is_output=True)
+    circuit += ops.PauliX(qubit=1)
+    circuit += ops.MeasureQubit(qubit=0, readout="ro", readout_index=0)
+    circuit += ops.MeasureQubit(qubit=1, readout="ro", readout_index=1)
+    other_circuit = Circuit()
+    other_circuit += ops.DefinitionBit(name="ro", length=2, is_output=True)
+    other_circuit += ops.PauliX(qubit=0)
+
+    backend = MyQLMBackend(
+        number_qubits=2, number_measurements=2, circuit_memoization_size=1
+    )
+
+    (bit_dict, _, _) = backend.run_circuit(circuit)
+    compiled_circuit = backend._compile_circuit(circuit.__copy__())
+    assert len(backend._compiled_circuits) == 1
+    (bit_dict_memoized, _, _) = backend.run_circuit(circuit)
+    npt.assert_equal(bit_dict_memoized, bit_dict)
+    assert backend._compile_circuit(circuit.__copy__()) is backend._compile_circuit(
+        circuit
+    )
+
+    backend.run_circuit(other_circuit)
+    assert len(backend._compiled_circuits) == 1
+    assert backend._compile_circuit(circuit) is not compiled_circuit
+
+    # With a memoization size of 0, every run translates the circuit again
+    backend = MyQLMBackend(
+        number_qubits=2, number_measurements=2, circuit_memoization_size=0
+    )
+    (bit_dict_unmemoized, _, _) = backend.run_circuit(circuit)
+    npt.assert_equal(bit_dict_unmemoized, bit_dict)
+    assert len(backend._compiled_circuits) == 0
+    assert backend._compile_circuit(circuit) is not backend._compile_circuit(circuit)
+
+
+@pytest.mark.parametrize("number_workers", [1, 2])
+def test_myqlm_backend_measurement_registers(number_workers):
+    """Testing that the circuits of a measurement are run with the constant circuit"""
+    constant_circuit = Circuit()
+    constant_circuit += ops.PauliX(qubit=0)
+    circuits = []
+    for readout in ["ro_first", "ro_second"]:
+        circuit = Circuit()
+        circuit += ops.DefinitionBit(name=readout, length=2, is_output=True)
+        if readout == "ro_second":
+            circuit += ops.PauliX(qubit=1)
+        circuit += ops.MeasureQubit(qubit=0, readout=readout, readout_index=0)
+        circuit += ops.MeasureQubit(qubit=1, readout=readout, readout_index=1)
+        circuits.append(circuit)
+    measurement = ClassicalRegister(
+        constant_circuit=constant_circuit, circuits=circuits
+    )
+
+    backend = MyQLMBackend(
+        number_qubits=2, number_measurements=3, number_workers=number_workers
+    )
+
+    (bit_dict, float_dict, complex_dict) = backend.run_measurement_registers(
+        measurement
+    )
+    npt.assert_equal(float_dict, dict())
+    npt.assert_equal(complex_dict, dict())
+    npt.assert_equal(bit_dict["ro_first"], [[True, False]] * 3)
+    npt.assert_equal(bit_dict["ro_second"], [[True, True]] * 3)
+
+
+def test_myqlm_backend_observable():
+    """Testing the MyQLM backend run with an observable"""
+    circuit = Circuit()
+    circuit += ops.DefinitionFloat(name="expectation", length=1, is_output=True)
+    circuit += ops.PauliX(qubit=0)
+
+    backend = MyQLMBackend(
+        number_qubits=2,
+        number_measurements=0,
+        job_type="OBS",
+        observable=np.diag([1, -1, -1, 1]),
+    )
+
+    (bit_dict, float_dict, complex_dict) = backend.run_circuit(circuit)
+    npt.assert_equal(bit_dict, dict())
+    npt.assert_equal(complex_dict, dict())
+    npt.assert_almost_equal(float_dict["expectation"], [[-1.0]])
+
+    # Reassigning the observable after construction is used by the next run
+    backend.observable = np.diag([1, -1, 1, -1])
+    (_, float_dict, _) = backend.run_circuit(circuit)
+    npt.assert_almost_equal(float_dict["expectation"], [[1.0]])
+
+
+def test_myqlm_backend_observable_without_float_register():
+    """Testing that an OBS run fails when the circuit has no output float register"""
+    circuit = Circuit()
+    circuit += ops.DefinitionBit(name="ro", length=1, is_output=True)
+    circuit += ops.PauliX(qubit=0)
+    circuit += ops.MeasureQubit(qubit=0, readout="ro", readout_index=0)
+
+    backend = MyQLMBackend(number_qubits=1, job_type="OBS", observable=np.diag([1, -1]))
+
+    with pytest.raises(RuntimeError, match="DefinitionFloat"):
+        backend.run_circuit(circuit)
+
+
 @pytest.mark.parametrize(
     "thetas, outcome",
     [  # 2*pi rotation with equal thetas
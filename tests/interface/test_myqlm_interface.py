@@ -66,6 +66,52 @@ def test_gate_translation(gate):
     assert myqlm_operation == gate[1]
 
 
+@pytest.mark.parametrize(
+    "operation, qubit_indices",
+    [
+        (ops.PhaseShiftState1(0, 0.3), [0]),
+        (ops.SingleQubitGate(0, 1.0, 0.0, 0.0, 0.0, 0.0), [0]),
+        (ops.XY(1, 0, 0.3), [1, 0]),
+    ],
+)
+def test_matrix_gate_translation(operation, qubit_indices):
+    """Test translation of gates without MyQLM counterpart via their unitary matrix"""
+    myqlm_operation = myqlm_call_operation(operation=operation, qureg=qubits)
+
+    assert myqlm_operation[1:] == [qubits[index] for index in qubit_indices]
+    npt.assert_array_almost_equal(
+        myqlm_operation[0].abstract_gate.matrix_generator(),
+        operation.unitary_matrix(),
+    )
+
+
+def test_matrix_gate_reuse():
+    """Test that gates with the same unitary matrix share the MyQLM gate definition"""
+    first = myqlm_call_operation(operation=ops.PhaseShiftState1(0, 0.3), qureg=qubits)
+    second = myqlm_call_operation(operation=ops.PhaseShiftState1(1, 0.3), qureg=qubits)
+    other = myqlm_call_operation(operation=ops.PhaseShiftState1(0, 0.4), qureg=qubits)
+
+    assert first[0].abstract_gate is second[0].abstract_gate
+    assert first[0].abstract_gate is not other[0].abstract_gate
+
+
+def test_rotation_gate_reuse():
+    """Test that rotations with the same angle share the MyQLM gate instance"""
+    first = myqlm_call_operation(operation=ops.RotateZ(0, 0.3), qureg=qubits)
+    second = myqlm_call_operation(operation=ops.RotateZ(1, 0.3), qureg=qubits)
+    other = myqlm_call_operation(operation=ops.RotateZ(0, 0.4), qureg=qubits)
+
+    assert first[0] is second[0]
+    assert first[0] is not other[0]
+    assert other[0] == qlm.RZ(0.4)
+
+
+def test_unsupported_operation():
+    """Test that operations not in the MyQLM interface raise an error"""
+    with pytest.raises(RuntimeError):
+        myqlm_call_operation(operation=ops.PragmaDamping(0, 0.1, 0.1), qureg=qubits)
+
+
 def test_circuit_translation():
     """Test translation of a full circuit with MyQLM interface"""
     circuit = Circuit()
@@ -113,5 +159,58 @@ def test_circuit_translation():
         assert op_trans == op_orig
 
 
+def test_circuit_translation_active_reset():
+    """Test translation of a circuit with an active reset with MyQLM interface"""
+    circuit = Circuit()
+    circuit += ops.PauliX(qubit=1)
+    circuit += ops.PragmaActiveReset(qubit=1)
+    circuit += ops.Hadamard(qubit=0)
+
+    myqlm_program = qlm.Program()
+    qubits = myqlm_program.qalloc(2)
+    myqlm_program.apply(qlm.X, qubits[1])
+    myqlm_program.reset([qubits[1]])
+    myqlm_program.apply(qlm.H, qubits[0])
+    myqlm_circuit = myqlm_program.to_circ()
+
+    translated_circuit = myqlm_call_circuit(circuit=circuit, number_qubits=2)
+
+    assert translated_circuit.ops == myqlm_circuit.ops
+
+
+@pytest.mark.parametrize("noise_mode_all_qubits", [False, True])
+def test_circuit_translation_loop(noise_mode_all_qubits):
+    """Test translation of a circuit with a PragmaLoop with MyQLM interface"""
+    loop_circuit = Circuit()
+    loop_circuit += ops.Hadamard(qubit=0)
+    loop_circuit += ops.RotateX(qubit=1, theta=0.3)
+    loop_circuit += ops.PragmaGlobalPhase(0.1)
+    # A loop without repetitions is not translated, even with unsupported operations
+    skipped_loop_circuit = Circuit()
+    skipped_loop_circuit += ops.PragmaDamping(0, 0.1, 0.1)
+    circuit = Circuit()
+    circuit += ops.PragmaLoop(repetitions=0, circuit=skipped_loop_circuit)
+    circuit += ops.PragmaLoop(repetitions=3, circuit=loop_circuit)
+
+    myqlm_program = qlm.Program()
+    qubits = myqlm_program.qalloc(2)
+    for _ in range(3):
+        myqlm_program.apply(qlm.H, qubits[0])
+        if noise_mode_all_qubits:
+            myqlm_program.apply(qlm.I, qubits[1])
+        myqlm_program.apply(qlm.RX(0.3), qubits[1])
+        if noise_mode_all_qubits:
+            myqlm_program.apply(qlm.I, qubits[0])
+    myqlm_circuit = myqlm_program.to_circ()
+
+    translated_circuit = myqlm_call_circuit(
+        circuit=circuit,
+        number_qubits=2,
+        noise_mode_all_qubits=noise_mode_all_qubits,
+    )
+
+    assert translated_circuit.ops == myqlm_circuit.ops
+
+
 if __name__ == "__main__":
     pytest.main(sys.argv)